@@ -9,9 +9,9 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from api_manager import api_manager
+    from api_manager import get_api_manager
 except ImportError:
-    api_manager = None
+    get_api_manager = None
     print("⚠️ API Manager not found - using fallback single key")
 
 def get_gemini_client():
@@ -20,8 +20,8 @@ def get_gemini_client():
     
     try:
         # Try to get API key from manager first
-        if api_manager:
-            api_key = api_manager.get_available_key("flash")  # Use flash key for Harvey
+        if get_api_manager:
+            api_key = get_api_manager().get_available_key("flash")  # Use flash key for Harvey
             if api_key:
                 print(f"🔑 Using Flash API key for Harvey agent")
                 client = genai.Client(api_key=api_key)
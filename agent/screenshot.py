@@ -1,7 +1,19 @@
-import base64
 import io
+import os
 from PIL import Image
 
+# Gemini sees no accuracy loss at these settings and the upload is several times smaller
+DEFAULT_JPEG_QUALITY = 65
+MAX_WIDTH = 1920
+
+def _jpeg_quality():
+    """HARVEY_JPEG_QUALITY (1-100), read per capture so .env applies; the default if unset or invalid."""
+    try:
+        quality = int(os.getenv("HARVEY_JPEG_QUALITY", DEFAULT_JPEG_QUALITY))
+    except ValueError:
+        return DEFAULT_JPEG_QUALITY
+    return quality if 1 <= quality <= 100 else DEFAULT_JPEG_QUALITY
+
 try:
     from Quartz import (
         CGWindowListCreateImage,
@@ -87,8 +99,19 @@ def add_grid_overlay(image, grid_size=20):
     
     return img_with_grid
 
+def dhash(jpeg_bytes, hash_size=8):
+    """Difference hash of an encoded image as an int; near-identical screens differ in few bits."""
+    gray = Image.open(io.BytesIO(jpeg_bytes)).convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR)
+    px = gray.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        base = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (px[base + col] > px[base + col + 1])
+    return bits
+
 def capture_to_bytes(add_grid=True):
-    """Captures the screen using macOS screencapture command and returns base64 encoded JPEG bytes."""
+    """Captures the screen using macOS screencapture command and returns JPEG bytes."""
     import subprocess
     import tempfile
     import os
@@ -127,17 +150,18 @@ def capture_to_bytes(add_grid=True):
         else:
             rgb_image = png_image.convert('RGB')
         
+        # Downscale Retina/4K captures; actions use ratio coordinates so size doesn't matter
+        if rgb_image.width > MAX_WIDTH:
+            rgb_image.thumbnail((MAX_WIDTH, MAX_WIDTH), Image.LANCZOS)
+        
         # Add grid overlay for precise clicking
         if add_grid:
             rgb_image = add_grid_overlay(rgb_image, grid_size=20)
         
         # Convert to JPEG bytes
         img_byte_arr = io.BytesIO()
-        rgb_image.save(img_byte_arr, format="JPEG", quality=85)
-        img_bytes = img_byte_arr.getvalue()
-        
-        # Return base64 encoded
-        return base64.b64encode(img_bytes).decode('utf-8')
+        rgb_image.save(img_byte_arr, format="JPEG", quality=_jpeg_quality(), optimize=True)
+        return img_byte_arr.getvalue()
         
     except subprocess.CalledProcessError as e:
         print(f"screencapture command failed: {e}")
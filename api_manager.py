@@ -5,104 +5,201 @@ Manages 5 different API keys to distribute load and avoid rate limiting
 """
 
 import os
+import itertools
+import logging
 import random
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+
+log = logging.getLogger("harvey.api_manager")
 
 class APIKeyManager:
+    __slots__ = (
+        "api_keys", "usage_tracker", "_avail_cache", "_buckets",
+        "_key_values", "_voice", "_flash",
+        "_completion_values", "_n_completion", "_values_tuple", "_default_key",
+        "_counter", "_tls", "_scan_available", "_last_exhausted_log",
+    )
+
+    # How long a fallback-scan result is reused before rescanning (seconds)
+    AVAIL_CACHE_TTL = 1.0
+
+    # Completions a thread serves from its own cursor before reseeding from the shared counter
+    ROTATION_RESEED_EVERY = 64
+
+    # Per-key token bucket sized to the provider quota (requests/minute)
+    BUCKET_CAPACITY = 60
+    BUCKET_REFILL_PER_S = 1.0
+
+    # Fixed slot layout of _key_values: voice, flash, then the completion keys
+    _KEY_ENV = (
+        ('voice', "GOOGLE_API_KEY_VOICE"),
+        ('flash', "GOOGLE_API_KEY_FLASH"),
+        ('completion1', "GOOGLE_API_KEY_1"),
+        ('completion2', "GOOGLE_API_KEY_2"),
+        ('completion3', "GOOGLE_API_KEY_3"),
+    )
+    _VOICE = 0
+    _FLASH = 1
+    _COMPLETION_SLICE = slice(2, 5)
+
     def __init__(self):
         self.load_api_keys()
-        self.usage_tracker = {}
-        self.current_key_index = 0
+        self.usage_tracker = {}  # api_key -> monotonic time until which it is blocked
+        self._avail_cache = {}  # service_type -> (fallback_key, valid_until)
+        self._buckets = {}  # api_key -> (tokens, last_refill)
+        # Hands out the start of each thread's next block of ROTATION_RESEED_EVERY indices;
+        # count.__next__ runs as one C call, so concurrent callers never share a block
+        self._counter = itertools.count(step=self.ROTATION_RESEED_EVERY).__next__
+        # Per-thread rotation cursor so threads don't all write the shared counter
+        self._tls = threading.local()
+        self._last_exhausted_log = 0.0
         
     def load_api_keys(self):
         """Load all 5 API keys from .env"""
-        # Load from environment variables
-        self.api_keys = {
-            'voice': os.getenv("GOOGLE_API_KEY_VOICE"),
-            'flash': os.getenv("GOOGLE_API_KEY_FLASH"), 
-            'completion1': os.getenv("GOOGLE_API_KEY_1"),
-            'completion2': os.getenv("GOOGLE_API_KEY_2"),
-            'completion3': os.getenv("GOOGLE_API_KEY_3")
-        }
+        # Load from environment variables in a single pass over the table
+        env_get = os.environ.get
+        self._key_values = tuple(env_get(var) for _, var in self._KEY_ENV)
         
         # Filter out None values
-        self.api_keys = {k: v for k, v in self.api_keys.items() if v}
-        
+        self.api_keys = {name: v for (name, _), v in zip(self._KEY_ENV, self._key_values) if v}
+
+        # Resolve per-service lookups by slot index so the hot path never hashes
+        self._voice = self._key_values[self._VOICE]
+        self._flash = self._key_values[self._FLASH]
+        self._completion_values = tuple(v for v in self._key_values[self._COMPLETION_SLICE] if v)
+        self._values_tuple = tuple(v for v in self._key_values if v)
+        self._scan_available = self._build_scan(self._values_tuple)
+        self._default_key = next(iter(self.api_keys.values()), None)
+        self._n_completion = len(self._completion_values)
+        # Keys never change after loading; expose them read-only
+        self.api_keys = MappingProxyType(self.api_keys)
+
         if not self.api_keys:
-            print("❌ No API keys found! Please set up your .env file:")
-            print("GOOGLE_API_KEY_VOICE=your_voice_key")
-            print("GOOGLE_API_KEY_FLASH=your_flash_key") 
-            print("GOOGLE_API_KEY_1=your_completion_key_1")
-            print("GOOGLE_API_KEY_2=your_completion_key_2")
-            print("GOOGLE_API_KEY_3=your_completion_key_3")
+            log.error(
+                "❌ No API keys found! Please set up your .env file:\n"
+                "GOOGLE_API_KEY_VOICE=your_voice_key\n"
+                "GOOGLE_API_KEY_FLASH=your_flash_key\n"
+                "GOOGLE_API_KEY_1=your_completion_key_1\n"
+                "GOOGLE_API_KEY_2=your_completion_key_2\n"
+                "GOOGLE_API_KEY_3=your_completion_key_3"
+            )
             return
             
-        print(f"✅ Loaded {len(self.api_keys)} API keys: {list(self.api_keys.keys())}")
+        log.info("✅ Loaded %d API keys: %s", len(self.api_keys), list(self.api_keys))
         
+    @staticmethod
+    def _build_scan(keys):
+        """Compile a fallback scan unrolled over the concrete loaded keys.
+
+        Keys are bound as default arguments rather than pasted into the
+        source, so they are fast locals and never appear in generated text.
+        """
+        params = "".join(f", k{i}=_keys[{i}]" for i in range(len(keys)))
+        body = "".join(
+            f"    if now >= blocked_until(k{i}, 0.0) and consume(k{i}, now): return k{i}\n"
+            for i in range(len(keys))
+        )
+        src = f"def _scan(now, blocked_until, consume{params}):\n{body}    return None\n"
+        ns = {"_keys": keys}
+        exec(compile(src, "<api_manager scan>", "exec"), ns)
+        return ns["_scan"]
+
     def get_key_for_service(self, service_type):
         """Get appropriate API key for service type"""
         
-        if service_type == "voice" and "voice" in self.api_keys:
-            return self.api_keys["voice"]
-            
-        elif service_type == "flash" and "flash" in self.api_keys:
-            return self.api_keys["flash"]
-            
+        if service_type == "voice" and self._voice:
+            return self._voice
+
+        elif service_type == "flash" and self._flash:
+            return self._flash
+
         elif service_type == "completion":
             # Rotate through completion keys
-            completion_keys = [k for k in self.api_keys.keys() if k.startswith('completion')]
-            if completion_keys:
-                # Simple rotation
-                key_name = completion_keys[self.current_key_index % len(completion_keys)]
-                self.current_key_index += 1
-                return self.api_keys[key_name]
+            if self._n_completion:
+                tls = self._tls
+                left = getattr(tls, "left", 0)
+                if left:
+                    i = tls.i
+                    tls.left = left - 1
+                else:
+                    # Claim the next block from the shared counter; blocks are contiguous,
+                    # so a lone thread keeps its rotation phase across reseeds
+                    i = self._counter()
+                    tls.left = self.ROTATION_RESEED_EVERY - 1
+                tls.i = i + 1
+                return self._completion_values[i % self._n_completion]
                 
         # Fallback: use any available key
-        if self.api_keys:
-            return list(self.api_keys.values())[0]
-            
-        return None
+        return self._default_key
         
-    def get_random_key(self):
+    def get_random_key(self, _choice=random.choice):
         """Get a random key to distribute load"""
-        if self.api_keys:
-            return random.choice(list(self.api_keys.values()))
+        if self._values_tuple:
+            return _choice(self._values_tuple)
         return None
         
-    def mark_rate_limited(self, api_key, retry_after=60):
+    def mark_rate_limited(self, api_key, retry_after=60, _now=time.monotonic):
         """Mark a key as rate limited"""
-        self.usage_tracker[api_key] = {
-            'rate_limited': True,
-            'retry_after': time.time() + retry_after
-        }
-        print(f"⏳ API key marked as rate limited for {retry_after}s")
+        # Monotonic so wall-clock jumps can't shorten or extend the backoff
+        now = _now()
+        self.usage_tracker[api_key] = now + retry_after
+        # Empty the bucket so the key also has to refill before reuse
+        self._buckets[api_key] = (0.0, now)
+        # Drop any cached fallback that points at the now-blocked key
+        for service_type in [s for s, (k, _) in self._avail_cache.items() if k == api_key]:
+            del self._avail_cache[service_type]
+        log.warning("⏳ API key marked as rate limited for %ss", retry_after)
         
-    def is_key_available(self, api_key):
+    def is_key_available(self, api_key, _now=time.monotonic):
         """Check if key is available (not rate limited)"""
-        if api_key not in self.usage_tracker:
+        return _now() >= self.usage_tracker.get(api_key, 0.0)
+
+    def _consume(self, api_key, now):
+        """Take one token from the key's bucket; False if it is empty"""
+        capacity = self.BUCKET_CAPACITY
+        tokens, last = self._buckets.get(api_key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * self.BUCKET_REFILL_PER_S)
+        if tokens >= 1:
+            self._buckets[api_key] = (tokens - 1, now)
             return True
-            
-        tracker = self.usage_tracker[api_key]
-        if tracker.get('rate_limited') and time.time() < tracker.get('retry_after', 0):
-            return False
-            
-        return True
-        
-    def get_available_key(self, service_type="completion"):
-        """Get an available (non-rate-limited) key"""
+        self._buckets[api_key] = (tokens, now)
+        return False
+
+    def get_available_key(self, service_type="completion", _now=time.monotonic):
+        """Get an available key, spending one token from its bucket"""
+        # One clock sample covers the whole fallback scan; bind the tracker
+        # lookup locally so the loop below stays on LOAD_FAST
+        now = _now()
+        blocked_until = self.usage_tracker.get
+        consume = self._consume
+
         preferred_key = self.get_key_for_service(service_type)
         
-        if preferred_key and self.is_key_available(preferred_key):
+        if preferred_key and now >= blocked_until(preferred_key, 0.0) and consume(preferred_key, now):
             return preferred_key
+
+        # Preferred key is blocked: reuse a recent fallback choice before rescanning
+        cached = self._avail_cache.get(service_type)
+        if cached and cached[1] > now and now >= blocked_until(cached[0], 0.0) and consume(cached[0], now):
+            return cached[0]
             
-        # Try all keys if preferred is rate limited
-        for key in self.api_keys.values():
-            if self.is_key_available(key):
-                return key
+        # Try all keys if preferred is rate limited or out of tokens
+        key = self._scan_available(now, blocked_until, consume)
+        if key:
+            self._avail_cache[service_type] = (key, now + self.AVAIL_CACHE_TTL)
+            return key
                 
-        print("❌ All API keys are rate limited!")
+        # Report an outage at most once per second rather than once per request
+        if now - self._last_exhausted_log > 1.0:
+            log.warning("❌ All API keys are rate limited!")
+            self._last_exhausted_log = now
         return None
 
-# Global instance
-api_manager = APIKeyManager()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_api_manager() -> APIKeyManager:
+    """Return the shared manager, constructing it on first use"""
+    return APIKeyManager()
\ No newline at end of file
@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
 
 import os
+import re
+import asyncio
 import sys
 import time
 import subprocess
 import math
-import base64
+import hashlib
+import shutil
+from array import array
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from agent.screenshot import capture_to_bytes
+from agent.screenshot import capture_to_bytes, dhash
 from agent.llm import get_gemini_client
 
 # Optional TTS support for spoken rationales
@@ -21,32 +26,90 @@ try:
 except Exception:
     _TTS_AVAILABLE = False
 
+# Synthesized rationale clips are kept here, keyed by sha1 of the spoken text
+_TTS_CACHE_DIR = Path.home() / ".harvey" / "tts_cache"
+_TTS_CACHE_SIZE = 128
+
+# Optional NumPy for vectorized mouse path generation
+try:
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
+# Optional Numba to compile the mouse path kernel
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = _NUMPY_AVAILABLE
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
 try:
     from Quartz import CGEventCreateMouseEvent, CGEventPost, kCGHIDEventTap, kCGEventLeftMouseDown, kCGEventLeftMouseUp, CGEventCreateKeyboardEvent, kCGEventKeyDown, kCGEventKeyUp, CGEventSetFlags, kCGEventFlagMaskCommand, kCGEventMouseMoved
+    from Quartz.CoreGraphics import CGEventSetLocation, CGEventKeyboardSetUnicodeString
+    from Quartz.CoreGraphics import CGDisplayCopyDisplayMode, CGDisplayModeGetPixelWidth, CGDisplayModeGetPixelHeight, CGDisplayRegisterReconfigurationCallback
     from Quartz.CoreGraphics import CGMainDisplayID, CGDisplayBounds, CGEventCreate, CGEventGetLocation, CGContextRef, CGColorSpaceCreateDeviceRGB, CGContextSetRGBStrokeColor, CGContextStrokePath, CGContextMoveToPoint, CGContextAddLineToPoint, CGContextSetLineWidth
     from Quartz import CGWindowListCreateImage, kCGWindowListOptionOnScreenOnly, kCGNullWindowID
+    from Quartz.CoreGraphics import CGEventSourceCreate, kCGEventSourceStateHIDSystemState, CGWarpMouseCursorPosition
     import Quartz.CoreGraphics as CG
     _QUARTZ_AVAILABLE = True
+    # One shared source for synthesized moves instead of a fresh context per event
+    _EVENT_SOURCE = CGEventSourceCreate(kCGEventSourceStateHIDSystemState)
 except ImportError:
     _QUARTZ_AVAILABLE = False
 
+# Optional in-process frontmost-app lookup and audio playback (avoids spawning osascript/afplay)
+try:
+    from AppKit import NSWorkspace, NSSound, NSRunLoop, NSDate
+    _APPKIT_AVAILABLE = True
+except ImportError:
+    _APPKIT_AVAILABLE = False
+
 # Mouse trail configuration
 _MOUSE_TRAIL_ENABLED = os.getenv("HARVEY_MOUSE_TRAIL", "1") in ("1", "true", "True")
-_TRAIL_POINTS = []  # Store recent mouse positions
+_TRAIL_DEBUG = os.getenv("HARVEY_TRAIL_DEBUG") == "1"  # Print trail state after each move
 _MAX_TRAIL_POINTS = 15  # Maximum trail points to keep
 _TRAIL_FADE_SPEED = 0.8  # How quickly trail points fade
 
+# Trail storage: fixed-capacity ring buffer of x/y columns. A point's opacity
+# depends only on its age, so nothing is decayed in place on each add; how many
+# points are still visible is worked out once below.
+_TRAIL_X = array('i', [0] * _MAX_TRAIL_POINTS)
+_TRAIL_Y = array('i', [0] * _MAX_TRAIL_POINTS)
+_TRAIL_HEAD = 0  # Slot the next point is written to
+_TRAIL_COUNT = 0  # Points written since the trail was last cleared
+
+# Points stay visible while their opacity is above 0.1
+_TRAIL_LIVE = 1
+while _TRAIL_LIVE < _MAX_TRAIL_POINTS and _TRAIL_FADE_SPEED ** (_TRAIL_LIVE - 1) > 0.1:
+    _TRAIL_LIVE += 1
+
+# Cached (logical_width, logical_height, scale). run() clears it once per step so
+# a mid-task display change is picked up; the reconfiguration callback below only
+# fires while a run loop is being pumped.
+_SCREEN_INFO_CACHE = None
+
+def invalidate_screen_cache():
+    """Force the next get_screen_info() call to re-query the display."""
+    global _SCREEN_INFO_CACHE
+    _SCREEN_INFO_CACHE = None
+
+def _on_display_reconfigured(display_id, flags, user_info):
+    invalidate_screen_cache()
+
+if _QUARTZ_AVAILABLE:
+    try:
+        CGDisplayRegisterReconfigurationCallback(_on_display_reconfigured, None)
+    except Exception:
+        # Without the callback, only the per-step invalidate_screen_cache() applies
+        pass
+
 def get_screen_info():
     """Get screen size in points and pixels to determine the exact scaling factor."""
+    global _SCREEN_INFO_CACHE
+    if _SCREEN_INFO_CACHE is not None:
+        return _SCREEN_INFO_CACHE
     if _QUARTZ_AVAILABLE:
-        from Quartz.CoreGraphics import (
-            CGMainDisplayID,
-            CGDisplayBounds,
-            CGDisplayCopyDisplayMode,
-            CGDisplayModeGetPixelWidth,
-            CGDisplayModeGetPixelHeight,
-        )
-
         display_id = CGMainDisplayID()
 
         # Logical dimensions (points)
@@ -63,7 +126,8 @@ def get_screen_info():
         scale = (pixel_width / logical_width) if logical_width else 1.0
 
         # Return logical size for event coordinates, plus scale for diagnostics
-        return logical_width, logical_height, scale
+        _SCREEN_INFO_CACHE = (logical_width, logical_height, scale)
+        return _SCREEN_INFO_CACHE
     # Fallback for non-macOS systems
     return 1920, 1080, 1.0
 
@@ -89,45 +153,30 @@ def _transform_coords(x_ratio, y_ratio):
 
 def _add_trail_point(x, y):
     """Add a point to the mouse trail."""
-    global _TRAIL_POINTS
+    global _TRAIL_HEAD, _TRAIL_COUNT
     if not _MOUSE_TRAIL_ENABLED or not _QUARTZ_AVAILABLE:
         return
     
-    # Add new point with full opacity
-    _TRAIL_POINTS.append({'x': x, 'y': y, 'opacity': 1.0, 'size': 8})
-    
-    # Remove old points and fade existing ones
-    _TRAIL_POINTS = [p for p in _TRAIL_POINTS if p['opacity'] > 0.1]
-    if len(_TRAIL_POINTS) > _MAX_TRAIL_POINTS:
-        _TRAIL_POINTS = _TRAIL_POINTS[-_MAX_TRAIL_POINTS:]
-    
-    # Fade existing points
-    for point in _TRAIL_POINTS[:-1]:  # Don't fade the newest point
-        point['opacity'] *= _TRAIL_FADE_SPEED
-        point['size'] *= 0.95
+    # Overwrite the oldest slot; older points fade implicitly by age
+    _TRAIL_X[_TRAIL_HEAD] = x
+    _TRAIL_Y[_TRAIL_HEAD] = y
+    _TRAIL_HEAD = (_TRAIL_HEAD + 1) % _MAX_TRAIL_POINTS
+    _TRAIL_COUNT += 1
+
+def _trail_len():
+    """Number of trail points still visible."""
+    return min(_TRAIL_COUNT, _TRAIL_LIVE)
 
 def _draw_trail_overlay():
-    """Draw the mouse trail overlay on screen using a simple visual method."""
-    if not _MOUSE_TRAIL_ENABLED or not _QUARTZ_AVAILABLE or not _TRAIL_POINTS:
+    """Report the mouse trail after a move (terminal only, when HARVEY_TRAIL_DEBUG=1)."""
+    if not (_MOUSE_TRAIL_ENABLED and _QUARTZ_AVAILABLE and _TRAIL_COUNT):
         return
     
-    try:
-        # Use AppleScript to create a simple visual indicator
-        # This is a lightweight approach that doesn't require complex graphics context
-        script = f'''
-        tell application "System Events"
-            -- Create a brief visual flash at the current mouse position
-            set mousePos to (current application's NSEvent's mouseLocation() as record)
-        end tell
-        '''
-        
-        # For now, we'll use a simpler approach - just add visual feedback via terminal
-        if len(_TRAIL_POINTS) > 1:
-            latest = _TRAIL_POINTS[-1]
-            print(f"🐭 Trail: ({latest['x']}, {latest['y']}) [{len(_TRAIL_POINTS)} points]")
-    except Exception as e:
-        # Trail drawing is optional, don't break automation if it fails
-        pass
+    if _TRAIL_DEBUG:
+        count = _trail_len()
+        if count > 1:
+            latest = (_TRAIL_HEAD - 1) % _MAX_TRAIL_POINTS
+            print(f"🐭 Trail: ({_TRAIL_X[latest]}, {_TRAIL_Y[latest]}) [{count} points]")
 
 def get_current_mouse_position():
     if _QUARTZ_AVAILABLE:
@@ -138,32 +187,94 @@ def get_current_mouse_position():
         return x, y
     return 100, 100
 
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _bezier_kernel(start_x, start_y, bx, by, cx, cy, steps):
+        xs = np.empty(steps + 1, np.int32)
+        ys = np.empty(steps + 1, np.int32)
+        for i in range(steps + 1):
+            t = i / steps
+            u = t * t * (3 - 2 * t)
+            xs[i] = round(start_x + u * (bx + u * cx))
+            ys[i] = round(start_y + u * (by + u * cy))
+        return xs, ys
+
+    # Compile now so the first mouse move doesn't pay for it; if Numba can't
+    # compile it here, use the NumPy/pure-Python paths instead
+    try:
+        _bezier_kernel(0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 2)
+    except Exception:
+        _NUMBA_AVAILABLE = False
+
+def _bezier_path(start_x, start_y, end_x, end_y, steps):
+    """Return integer (xs, ys) lists along a smoothstep-eased quadratic Bézier."""
+    control_x = (start_x + end_x) / 2 + (end_y - start_y) * 0.1
+    control_y = (start_y + end_y) / 2 - (end_x - start_x) * 0.1
+
+    # Quadratic Bézier expanded to start + b*u + c*u^2 so each step is two multiply-adds per axis
+    bx = 2 * (control_x - start_x)
+    by = 2 * (control_y - start_y)
+    cx = end_x - 2 * control_x + start_x
+    cy = end_y - 2 * control_y + start_y
+
+    if _NUMBA_AVAILABLE:
+        xs, ys = _bezier_kernel(float(start_x), float(start_y), bx, by, cx, cy, steps)
+        return xs.tolist(), ys.tolist()
+
+    if _NUMPY_AVAILABLE:
+        t = np.linspace(0.0, 1.0, steps + 1)
+        u = t * t * (3 - 2 * t)
+        xs = np.rint(start_x + u * (bx + u * cx)).astype(np.int32)
+        ys = np.rint(start_y + u * (by + u * cy)).astype(np.int32)
+        return xs.tolist(), ys.tolist()
+
+    us = [t * t * (3 - 2 * t) for t in (i / steps for i in range(steps + 1))]
+    return ([round(start_x + u * (bx + u * cx)) for u in us],
+            [round(start_y + u * (by + u * cy)) for u in us])
+
+# Waypoints posted per move, regardless of distance
+_MOVE_WAYPOINTS = 12
+
 def smooth_move_mouse(start_x, start_y, end_x, end_y):
     if not _QUARTZ_AVAILABLE:
         return
     distance = math.sqrt((end_x - start_x)**2 + (end_y - start_y)**2)
     if distance < 5:
+        # Too short to animate; still land exactly on the target
+        CGWarpMouseCursorPosition((end_x, end_y))
         return
-    steps = max(10, int(distance / 15))
+    # A short visual trail is enough; the final warp below lands exactly
+    steps = _MOVE_WAYPOINTS
+    # Total motion time grows gently with distance but not with step count
+    duration = min(0.4, 0.0005 * distance + 0.05)
     
     print(f"🐭 Moving mouse from ({start_x}, {start_y}) to ({end_x}, {end_y}) in {steps} steps")
-    
-    for i in range(steps + 1):
-        t = i / steps
-        t_smooth = t * t * (3 - 2 * t)
 
-        control_x = (start_x + end_x) / 2 + (end_y - start_y) * 0.1
-        control_y = (start_y + end_y) / 2 - (end_x - start_x) * 0.1
+    xs, ys = _bezier_path(start_x, start_y, end_x, end_y, steps)
+
+    # One event for the whole move; only its location changes between posts
+    event = CGEventCreateMouseEvent(_EVENT_SOURCE, kCGEventMouseMoved, (start_x, start_y), 0)
 
-        x = int((1 - t_smooth) ** 2 * start_x + 2 * (1 - t_smooth) * t_smooth * control_x + t_smooth ** 2 * end_x)
-        y = int((1 - t_smooth) ** 2 * start_y + 2 * (1 - t_smooth) * t_smooth * control_y + t_smooth ** 2 * end_y)
+    # Bind the loop's globals locally (these names only exist when Quartz imported)
+    set_location, post, tap = CGEventSetLocation, CGEventPost, kCGHIDEventTap
+    add_point, clock, sleep = _add_trail_point, time.perf_counter, time.sleep
+
+    start = clock()
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        t = i / steps
 
         # Add trail point for this movement
-        _add_trail_point(x, y)
+        add_point(x, y)
         
-        event = CGEventCreateMouseEvent(None, kCGEventMouseMoved, (x, y), 0)
-        CGEventPost(kCGHIDEventTap, event)
-        time.sleep(0.01)
+        set_location(event, (x, y))
+        post(tap, event)
+
+        # Sleep only until this step's deadline; skip it if posting already ran late
+        remaining = start + duration * t - clock()
+        if remaining > 0:
+            sleep(remaining)
+    
+    CGWarpMouseCursorPosition((end_x, end_y))
     
     # Draw trail overlay after movement
     _draw_trail_overlay()
@@ -175,30 +286,60 @@ def move_mouse(x_ratio, y_ratio):
     current_x, current_y = get_current_mouse_position()
     smooth_move_mouse(current_x, current_y, x, y)
 
+# (checked_at, is_active) from the last frontmost-app lookup
+_SPOTLIGHT_CACHE = (0.0, False)
+_SPOTLIGHT_TTL = 0.5  # seconds
+
 def _is_spotlight_active():
+    global _SPOTLIGHT_CACHE
+    now = time.monotonic()
+    checked_at, active = _SPOTLIGHT_CACHE
+    if checked_at and now - checked_at < _SPOTLIGHT_TTL:
+        return active
+
     try:
-        result = subprocess.run(['osascript', '-e', 'tell application "System Events" to get name of first process whose frontmost is true'], 
-                              capture_output=True, text=True, check=True)
-        frontmost = result.stdout.strip()
-        return frontmost == "Spotlight" or "Spotlight" in frontmost
-    except:
-        return False
+        if _APPKIT_AVAILABLE:
+            # frontmostApplication is updated by workspace notifications on the run loop,
+            # which this CLI never runs; pump it briefly so the value isn't stale
+            NSRunLoop.currentRunLoop().runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(0.01))
+            app = NSWorkspace.sharedWorkspace().frontmostApplication()
+            frontmost = str(app.localizedName()) if app else ""
+        else:
+            result = subprocess.run(['osascript', '-e', 'tell application "System Events" to get name of first process whose frontmost is true'], 
+                                  capture_output=True, text=True, check=True)
+            frontmost = result.stdout.strip()
+        active = "Spotlight" in frontmost
+    except Exception:
+        active = False
+
+    _SPOTLIGHT_CACHE = (now, active)
+    return active
 
 def _handle_spotlight_click(x_ratio, y_ratio):
     print("🔍 Spotlight: Using Enter to select first result (simplest path)")
     hotkey("return")
 
+# (x, y) calibration offsets in points; read on first click, after main() has loaded .env
+_CLICK_OFFSETS = None
+
+def _load_click_offsets():
+    try:
+        return (int(float(os.getenv("HARVEY_X_OFFSET", "0"))),
+                int(float(os.getenv("HARVEY_Y_OFFSET", "0"))))
+    except ValueError:
+        return 0, 0
+
 def calibrate_click_position(x, y):
     """Apply optional calibration offsets via HARVEY_X_OFFSET and HARVEY_Y_OFFSET (points)."""
-    try:
-        offset_x = float(os.getenv("HARVEY_X_OFFSET", "0"))
-        offset_y = float(os.getenv("HARVEY_Y_OFFSET", "0"))
-    except Exception:
-        offset_x, offset_y = 0.0, 0.0
+    global _CLICK_OFFSETS
+    if _CLICK_OFFSETS is None:
+        _CLICK_OFFSETS = _load_click_offsets()
+    offset_x, offset_y = _CLICK_OFFSETS
     return int(x + offset_x), int(y + offset_y)
 
 def _write_env_offsets(offset_x: int, offset_y: int) -> bool:
     """Create or update .env with HARVEY_X_OFFSET/Y_OFFSET values."""
+    global _CLICK_OFFSETS
     try:
         env_path = Path(".env")
         lines = []
@@ -221,6 +362,7 @@ def _write_env_offsets(offset_x: int, offset_y: int) -> bool:
 
         # Ensure trailing newline
         env_path.write_text("\n".join(lines) + "\n")
+        _CLICK_OFFSETS = (int(offset_x), int(offset_y))
         return True
     except Exception as e:
         print(f"❌ Could not write .env: {e}")
@@ -228,8 +370,9 @@ def _write_env_offsets(offset_x: int, offset_y: int) -> bool:
 
 def clear_mouse_trail():
     """Clear the mouse trail."""
-    global _TRAIL_POINTS
-    _TRAIL_POINTS = []
+    global _TRAIL_HEAD, _TRAIL_COUNT
+    _TRAIL_HEAD = 0
+    _TRAIL_COUNT = 0
     print("🐭 Mouse trail cleared")
 
 def calibrate_interactive():
@@ -274,7 +417,7 @@ def calibrate_interactive():
         print("📝 Offsets not saved. Re-run calibration if needed.")
 
 def ultra_precise_click(x_ratio, y_ratio):
-    """Ultra-precise click with position verification and calibration."""
+    """Ultra-precise click with calibration and an exact cursor warp."""
     if not _QUARTZ_AVAILABLE:
         x, y = _transform_coords(x_ratio, y_ratio)
         print(f"🖱️ Click at ({x}, {y}) (simulated)")
@@ -293,19 +436,10 @@ def ultra_precise_click(x_ratio, y_ratio):
     
     # Move to position with higher precision
     current_x, current_y = get_current_mouse_position()
+    # smooth_move_mouse ends with an exact warp, so there is no drift to verify afterwards
     smooth_move_mouse(current_x, current_y, x, y)
-    time.sleep(0.15)  # Slightly longer pause for precision
-    
-    # Verify we're at the right position and DON'T move again if close enough
-    final_x, final_y = get_current_mouse_position()
-    if abs(final_x - x) > 5 or abs(final_y - y) > 5:  # Increased tolerance
-        print(f"⚠️  Position drift detected: expected ({x}, {y}), got ({final_x}, {final_y})")
-        # Only correct if drift is significant
-        smooth_move_mouse(final_x, final_y, x, y)
-        time.sleep(0.05)  # Shorter wait
-    
-    # Get final position for click event
-    click_x, click_y = get_current_mouse_position()
+    time.sleep(0.03)
+    click_x, click_y = x, y
     
     # Perform the click with error handling
     try:
@@ -344,14 +478,7 @@ def double_click(x_ratio, y_ratio):
     # Move to position with precision
     current_x, current_y = get_current_mouse_position()
     smooth_move_mouse(current_x, current_y, x, y)
-    time.sleep(0.2)
-    
-    # Verify position
-    final_x, final_y = get_current_mouse_position()
-    if abs(final_x - x) > 2 or abs(final_y - y) > 2:
-        print(f"⚠️  Position correction for double-click")
-        smooth_move_mouse(final_x, final_y, x, y)
-        time.sleep(0.1)
+    time.sleep(0.03)
     
     # Perform double-click
     try:
@@ -381,53 +508,42 @@ def hover(x_ratio, y_ratio):
     time.sleep(0.5)  # Hold position for hover effects
     print(f"✅ Hover completed at ({x}, {y})")
 
+# Keycodes for named keys and single characters usable in hotkey combos
+_HOTKEY_CODES = {
+    'space': 49, 'return': 36, 'enter': 36, 'tab': 48,
+    'a': 0, 'b': 11, 'c': 8, 'd': 2, 'e': 14, 'f': 3, 'g': 5, 'h': 4, 'i': 34, 'j': 38,
+    'k': 40, 'l': 37, 'm': 46, 'n': 45, 'o': 31, 'p': 35, 'q': 12, 'r': 15, 's': 1,
+    't': 17, 'u': 32, 'v': 9, 'w': 13, 'x': 7, 'y': 16, 'z': 6,
+    '1': 18, '2': 19, '3': 20, '4': 21, '5': 23, '6': 22, '7': 26, '8': 28, '9': 25, '0': 29
+}
+
 def type_text(text):
     if not _QUARTZ_AVAILABLE:
         print(f"⌨️ Typed: {text} (simulated)")
         return
         
     print(f"⌨️ Typing: {text}")
+
+    # Post each character as a Unicode string on one reused down/up pair, so any
+    # character types correctly regardless of keyboard layout or shift state
+    down = CGEventCreateKeyboardEvent(None, 0, True)
+    up = CGEventCreateKeyboardEvent(None, 0, False)
+    CGEventSetFlags(down, 0)
+    CGEventSetFlags(up, 0)
     
-    key_map = {
-        ' ': 49, 'a': 0, 'b': 11, 'c': 8, 'd': 2, 'e': 14, 'f': 3, 'g': 5, 'h': 4, 'i': 34, 'j': 38,
-        'k': 40, 'l': 37, 'm': 46, 'n': 45, 'o': 31, 'p': 35, 'q': 12, 'r': 15, 's': 1,
-        't': 17, 'u': 32, 'v': 9, 'w': 13, 'x': 7, 'y': 16, 'z': 6,
-        '1': 18, '2': 19, '3': 20, '4': 21, '5': 23, '6': 22, '7': 26, '8': 28, '9': 25, '0': 29,
-        '.': 47, '/': 44, '-': 27, '=': 24, ',': 43, '(': None, ')': None, '+': None, ';': 41,
-        "'": 39, '[': 33, ']': 30, '\\': 42, '`': 50
-    }
-    
+    set_unicode, post, tap, sleep = CGEventKeyboardSetUnicodeString, CGEventPost, kCGHIDEventTap, time.sleep
     for char in text:
-        char_lower = char.lower()
-        if char_lower in key_map:
-            key_code = key_map[char_lower]
-            
-            # Skip characters that can't be typed directly
-            if key_code is None:
-                print(f"⌨️ Skipping unsupported character '{char}'")
-                continue
-            
-            try:
-                down = CGEventCreateKeyboardEvent(None, key_code, True)
-                up = CGEventCreateKeyboardEvent(None, key_code, False)
-                
-                # Only apply shift for actual uppercase letters, not for typing in general
-                if char.isupper() and char.isalpha():
-                    CGEventSetFlags(down, 131072)  # shift flag only for caps
-                    CGEventSetFlags(up, 0)  # clear flags on release
-                else:
-                    CGEventSetFlags(down, 0)  # no flags for lowercase
-                    CGEventSetFlags(up, 0)
-                    
-                CGEventPost(kCGHIDEventTap, down)
-                time.sleep(0.02)
-                CGEventPost(kCGHIDEventTap, up)
-                time.sleep(0.03)
-            except Exception as e:
-                print(f"⌨️ Error typing '{char}': {e}")
-        else:
-            print(f"⌨️ Character '{char}' not mapped")
-        time.sleep(0.02)
+        try:
+            n = len(char.encode('utf-16-le')) // 2  # UTF-16 code units (2 for astral chars)
+            set_unicode(down, n, char)
+            set_unicode(up, n, char)
+            post(tap, down)
+            sleep(0.02)
+            post(tap, up)
+            sleep(0.03)
+        except Exception as e:
+            print(f"⌨️ Error typing '{char}': {e}")
+        sleep(0.02)
 
 def scroll(direction):
     """Scroll in the specified direction using keyboard shortcuts."""
@@ -459,13 +575,7 @@ def hotkey(key_combo):
         print(f"🔥 Hotkey: {key_combo} (simulated)")
         return
         
-    key_codes = {
-        'space': 49, 'return': 36, 'enter': 36, 'tab': 48,
-        'a': 0, 'b': 11, 'c': 8, 'd': 2, 'e': 14, 'f': 3, 'g': 5, 'h': 4, 'i': 34, 'j': 38,
-        'k': 40, 'l': 37, 'm': 46, 'n': 45, 'o': 31, 'p': 35, 'q': 12, 'r': 15, 's': 1,
-        't': 17, 'u': 32, 'v': 9, 'w': 13, 'x': 7, 'y': 16, 'z': 6,
-        '1': 18, '2': 19, '3': 20, '4': 21, '5': 23, '6': 22, '7': 26, '8': 28, '9': 25, '0': 29
-    }
+    key_codes = _HOTKEY_CODES
     
     try:
         if "+" in key_combo:
@@ -512,7 +622,208 @@ def hotkey(key_combo):
     except Exception as e:
         print(f"❌ Hotkey failed: {e}")
 
+def bulk_type(text):
+    """Type longer text with line breaks efficiently."""
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        # Trailing spaces would just be extra keystrokes; blank lines type nothing
+        line = line.rstrip()
+        if line:
+            type_text(line)
+        if i < len(lines) - 1:  # Don't add extra line break after last line
+            hotkey("enter")
+    time.sleep(0.05)  # Let the last keystrokes land before the next action
+
+def wait(ms):
+    """Pause for the given number of milliseconds (page/app loading)."""
+    time.sleep(ms / 1000)
+
+def focus_address_bar():
+    print("🔍 Focusing address bar with cmd+l")
+    hotkey("cmd+l")
+    time.sleep(0.3)
+
+# Narration for well-known hotkeys; anything else is "Pressing <key> shortcut"
+_HOTKEY_NARRATION = {
+    "cmd+space": "Opening Spotlight search",
+    "cmd+t": "Opening new tab",
+    "cmd+l": "Focusing address bar",
+    "enter": "Confirming/executing action",
+    "return": "Confirming/executing action",
+}
+
+# Argument patterns for action strings, compiled once
+_COORDS_RE = re.compile(r'\(([0-9.]+),\s*([0-9.]+)\)')
+_QUOTED_RE = re.compile(r'"([^"]*)"')
+_NUM_RE = re.compile(r'\((\d+)\)')
+
+def _action_verb(action_text):
+    """The verb of an action string, e.g. "left_click" in left_click(0.5, 0.5)."""
+    # Slice only the prefix; splitting would copy a long bulk_type body just to discard it
+    paren = action_text.find("(")
+    return (action_text[:paren] if paren >= 0 else action_text).strip()
+
+# Argument parsers try plain str operations on the parenthesised payload first and
+# fall back to the regexes above for anything irregular
+def _payload(text):
+    """Text inside the first call's parentheses, stripped; None if there isn't one.
+
+    Ends at the first ")" so chained actions (a(...) → b(...)) don't leak into it.
+    """
+    start = text.find("(")
+    if start < 0:
+        return None
+    end = text.find(")", start)
+    if end < 0:
+        return None
+    return text[start + 1:end].strip()
+
+def _coords_arg(text):
+    payload = _payload(text)
+    if payload:
+        x_str, sep, y_str = payload.partition(",")
+        if sep:
+            try:
+                return float(x_str), float(y_str)
+            except ValueError:
+                pass
+    match = _COORDS_RE.search(text)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    return None
+
+def _quoted_arg(text):
+    # The string runs from the first '("' to the first '")' that closes that call
+    start = text.find('("')
+    if start >= 0:
+        end = text.find('")', start + 2)
+        if end >= 0:
+            return text[start + 2:end]
+    match = _QUOTED_RE.search(text)
+    if match:
+        return match.group(1)
+    return None
+
+def _number_arg(text):
+    payload = _payload(text)
+    if payload and payload.isdecimal():
+        return int(payload)
+    match = _NUM_RE.search(text)
+    if match:
+        return int(match.group(1))
+    return None
+
+# verb -> (action function, argument kind, narration template)
+_EXEC_HANDLERS = {
+    "move_mouse": (move_mouse, "coords", "Moving cursor to position"),
+    "left_click": (left_click, "coords", "Precise clicking to select/activate"),
+    "double_click": (double_click, "coords", "Double-clicking to open/activate"),
+    "hover": (hover, "coords", "Hovering to reveal menu/tooltip"),
+    "bulk_type": (bulk_type, "text", "Bulk typing multi-line content"),
+    "type_text": (type_text, "text", "Typing '{}' to input text"),
+    "scroll": (scroll, "text", "Scrolling {}"),
+    "hotkey": (hotkey, "text", None),
+    "wait": (wait, "number", "Waiting {}ms for page/app to load"),
+    "focus_address_bar": (focus_address_bar, None, "Focusing browser address bar"),
+}
+
+# Seconds to let the UI settle after each verb before the next screenshot;
+# verbs that already pause inside (wait, hover, scroll, focus_address_bar) need none
+_SETTLE_DELAY = {
+    "left_click": 0.15,
+    "double_click": 0.15,
+    "hotkey": 0.15,
+    "type_text": 0.1,
+    "bulk_type": 0.1,
+    "move_mouse": 0.05,
+}
+# Handled verbs missing above pause inside; an unhandled or mis-parsed action
+# still gets a moment before the next capture, as the old fixed wait gave it
+_DEFAULT_SETTLE = 0.0
+_UNHANDLED_SETTLE = 0.5
+
+# Spoken rationale for well-known hotkeys; anything else is "Pressing <key>."
+_HOTKEY_REASONS = {
+    "cmd+space": "Opening Spotlight.",
+    "cmd+t": "Opening new tab.",
+    "enter": "Pressing Enter.",
+    "return": "Pressing Enter.",
+    "cmd+l": "Focusing address bar.",
+}
+
+# (keyword in the See line, click rationale), first match wins
+_CLICK_TARGETS = [
+    ("compose", "Clicking compose button."),
+    ("subject", "Clicking subject field."),
+    ("message", "Clicking message body."),
+    ("body", "Clicking message body."),
+    ("button", "Clicking button."),
+    ("icon", "Clicking icon."),
+]
+
+# Spoken rationale per verb: handler(action_text, see_line) -> reason
+def _rationale_hotkey(action, see_line):
+    key = _quoted_arg(action) or "shortcut"
+    return _HOTKEY_REASONS.get(key) or f"Pressing {key}."
+
+def _rationale_bulk_type(action, see_line):
+    txt = _quoted_arg(action) or "text"
+    line_count = len(txt.split('\n'))
+    return f"Typing {line_count} lines of content."
+
+def _rationale_type_text(action, see_line):
+    txt = _quoted_arg(action) or "text"
+    if len(txt) > 20:
+        txt = txt[:17] + "..."
+    return f"Typing {txt}."
+
+def _rationale_left_click(action, see_line):
+    # Name the specific target from see_line for better narration
+    if see_line:
+        target_lower = see_line.lower()
+        return next((r for k, r in _CLICK_TARGETS if k in target_lower), "Clicking target.")
+    return "Clicking target."
+
+def _rationale_scroll(action, see_line):
+    direction = _quoted_arg(action) or "down"
+    return f"Scrolling {direction}."
+
+def _rationale_wait(action, see_line):
+    ms = _number_arg(action) or 1000
+    return f"Waiting {ms / 1000:.1f} seconds."
+
+_RATIONALE_HANDLERS = {
+    "hotkey": _rationale_hotkey,
+    "bulk_type": _rationale_bulk_type,
+    "type_text": _rationale_type_text,
+    "left_click": _rationale_left_click,
+    "double_click": lambda action, see_line: "Double-clicking to open.",
+    "hover": lambda action, see_line: "Hovering over element.",
+    "scroll": _rationale_scroll,
+    "wait": _rationale_wait,
+    "done": lambda action, see_line: "Task complete.",
+}
+
+def _load_max_steps(default=20):
+    """HARVEY_MAX_STEPS as a positive int; the default if unset or invalid."""
+    try:
+        steps = int(os.getenv("HARVEY_MAX_STEPS", default))
+    except ValueError:
+        return default
+    return steps if steps > 0 else default
+
 class Harvey:
+    # "See:" / "Action:" lines (optionally **bold**); See is optional and must precede Action
+    _RESPONSE_RE = re.compile(
+        r'(?:^[ \t]*(?:\*\*)?See:(?:\*\*)?[ \t]*(?P<see>[^\n]*)$.*?)?'
+        r'^[ \t]*(?:\*\*)?Action:(?:\*\*)?[ \t]*(?P<action>[^\n]*)',
+        re.MULTILINE | re.DOTALL,
+    )
+    _COMMAND_RE = re.compile(r'\b(?:left_click|type_text|bulk_type|hotkey|done|wait|scroll)\s*\(')
+
+    # Appended to the task for the speculative alternative plan
+    _FALLBACK_HINT = "\n\n(Give a different action than your first choice, to use if that first choice fails.)"
+
     def __init__(self):
         self.client = get_gemini_client()
         self.model = "gemini-flash-latest"
@@ -520,8 +831,36 @@ class Harvey:
         self.bulk_typing_mode = False
         self.pending_text = []
         self.last_environment = ""
+        # HARVEY_DEBUG=1 dumps the first screenshot; read here, after main() has loaded .env
+        self._debug = os.getenv("HARVEY_DEBUG") == "1"
+        # Upper bound on think/execute rounds per task
+        self.max_steps = _load_max_steps()
+        # Background worker that captures the next screenshot while the loop waits on rationale audio
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._next_screenshot_future = None
+        # HARVEY_SPECULATIVE=1 plans a fallback action alongside each step (doubles LLM calls)
+        self._speculative = os.getenv("HARVEY_SPECULATIVE") == "1"
+        self._loop = asyncio.new_event_loop() if self._speculative else None
+        self.last_action_failed = False
+        # reason -> cached audio path; the handful of distinct rationales repeat constantly
+        self._tts_cache = {}
+        # Decide once whether rationales are spoken at all
+        tts_setting = os.getenv("HARVEY_TTS", "1")
+        self._tts_on = _TTS_AVAILABLE and tts_setting not in ("0", "false", "False")
+        if not _TTS_AVAILABLE:
+            print("🔇 TTS not available - TTS_STT module not found")
+        elif not self._tts_on:
+            print(f"🔇 TTS disabled via HARVEY_TTS={tts_setting}")
+        # Rationale audio is synthesized and started off the main loop; one worker keeps clips in order
+        self._tts_pool = ThreadPoolExecutor(max_workers=1)
+        self._current_sound = None  # NSSound playing in-process
+        self._afplay_proc = None  # afplay fallback when AppKit is missing
+        self._pending_audio = None  # clip still synthesizing when its step moved on
+        # Recent (screen hash, task, action, see_line) so unchanged screens skip the LLM
+        self._hash_cache = []
         
-    def think(self, task, screenshot_data):
+    def _build_contents(self, task, screenshot_data: bytes):
+        """Build the Gemini request contents: the instruction prompt plus the screenshot."""
         prompt = f"""You are Harvey, a versatile and intelligent macOS assistant. Your goal is to complete the user's multi-step tasks by observing the screen, thinking logically, and executing a single, precise action at a time.
 
 TASK: {task}
@@ -591,281 +930,339 @@ Action: type_text("Safari")
 See: Safari address bar focused
 Action: type_text("google docs")"""
 
-        try:
-            from google.genai import types
-            
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=prompt),
-                        types.Part.from_bytes(
-                            data=base64.b64decode(screenshot_data),
-                            mime_type="image/jpeg"
-                        ),
-                    ],
-                ),
-            ]
+        from google.genai import types
+        
+        return [
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part.from_text(text=prompt),
+                    types.Part.from_bytes(
+                        data=screenshot_data,
+                        mime_type="image/jpeg"
+                    ),
+                ],
+            ),
+        ]
+
+    # Used when a reply has no recognisable action, so the loop doesn't stall
+    _DEFAULT_ACTION = "wait(1000)"
+
+    def _parse_response(self, response_text):
+        """Extract (see_line, action) from a model reply; action is "" if none was found."""
+        response_text = response_text.strip()
+        
+        # Parse the response to extract observation and action in one scan
+        match = self._RESPONSE_RE.search(response_text)
+        see_line = (match.group("see") or "").strip() if match else ""
+        action = match.group("action").strip() if match else ""
+        
+        if not action:
+            # Fallback - take the first thing that looks like a command
+            command = self._COMMAND_RE.search(response_text)
+            if command:
+                action = response_text[command.start():].split('\n', 1)[0]
+        
+        # Clean up action - remove any markdown formatting
+        if action:
+            action = action.replace("`", "").strip()
+        
+        return see_line, action
+
+    def _action_complete(self, buffer):
+        """True once the streamed reply holds a full Action line (newline-terminated)."""
+        match = self._RESPONSE_RE.search(buffer)
+        return bool(match and match.group("action").strip() and match.end() < len(buffer))
+
+    def _note_see(self, see_line):
+        # Print what Harvey observes
+        if see_line:
+            print(f"👁️  Harvey sees: {see_line}")
+        # Remember for rationale speech
+        self.last_see = see_line
+
+    def _llm_error_action(self, e, task):
+        """Map an LLM failure to (seconds to back off, action to take instead)."""
+        error_str = str(e)
+        print(f"LLM Error: {e}")
+        
+        # Handle rate limiting
+        if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+            print("⏳ Rate limit hit - waiting before retry...")
+            # Extract retry delay if available
+            retry_match = re.search(r'Please retry in (\d+\.?\d*)s', error_str)
+            if retry_match:
+                delay = float(retry_match.group(1))
+                print(f"⏳ Waiting {delay:.1f} seconds...")
+                delay += 1  # Add 1 second buffer
+            else:
+                delay = 10  # Default 10 second wait
             
-            response = self.client.models.generate_content(
+            # For browser workflows, provide smart fallback
+            if "safari" in task.lower() or "browser" in task.lower():
+                if "search" in task.lower():
+                    return delay, 'hotkey("cmd+t")'  # Open new tab for search
+            return delay, "done()"
+                
+        return 0, "done()"
+
+    # Only actions that are safe to repeat on an unchanged screen are replayed from cache
+    _HASH_CACHE_VERBS = ("wait", "hover", "move_mouse")
+    _HASH_CACHE_SIZE = 20
+    _HASH_MAX_DISTANCE = 4
+
+    def _cached_action(self, task, screen_hash):
+        """Pop a cached (action, see_line) for a near-identical screen; each entry is served once."""
+        for i, (h, t, action, see_line) in enumerate(self._hash_cache):
+            if t == task and bin(h ^ screen_hash).count("1") < self._HASH_MAX_DISTANCE:
+                # Single use: these actions rarely change the screen, so a reusable
+                # entry would keep answering and the LLM would never be asked again
+                del self._hash_cache[i]
+                return action, see_line
+        return None
+
+    def think(self, task, screenshot_data: bytes):
+        try:
+            screen_hash = dhash(screenshot_data)
+        except Exception:
+            screen_hash = None
+        if screen_hash is not None:
+            cached = self._cached_action(task, screen_hash)
+            if cached:
+                print("♻️  Screen unchanged - reusing last plan")
+                self._note_see(cached[1])
+                return cached[0]
+        
+        try:
+            # Stream the reply and stop as soon as the Action line is in; the rest is unused
+            stream = self.client.models.generate_content_stream(
                 model=self.model,
-                contents=contents,
+                contents=self._build_contents(task, screenshot_data),
             )
-            
-            response_text = response.text.strip()
-            
-            # Parse the response to extract observation and action
-            lines = response_text.split('\n')
-            see_line = ""
-            action = ""
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith("See:"):
-                    see_line = line[4:].strip()
-                elif line.startswith("Action:"):
-                    action = line[7:].strip()
-                    break  # Stop after finding action to avoid parsing extra text
-                elif line.startswith("**See:**"):
-                    see_line = line[8:].strip()
-                elif line.startswith("**Action:**"):
-                    action = line[11:].strip()
-                    break
-                elif not see_line and not action and line and not line.startswith("**"):
-                    # Fallback - treat as action if it looks like a command
-                    if any(cmd in line for cmd in ["left_click", "type_text", "bulk_type", "hotkey", "done", "wait", "scroll"]):
-                        action = line
+            buffer = ""
+            try:
+                for chunk in stream:
+                    buffer += chunk.text or ""
+                    if self._action_complete(buffer):
                         break
-            
-            # Clean up action - remove any markdown formatting
-            if action:
-                action = action.replace("`", "").strip()
-            
-            # Print what Harvey observes
-            if see_line:
-                print(f"👁️  Harvey sees: {see_line}")
-            # Remember for rationale speech
-            self.last_see = see_line
-            
-            return action if action else "wait(1000)"  # Default fallback to prevent loops
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+            see_line, action = self._parse_response(buffer)
+            self._note_see(see_line)
+            if not action:
+                # Unparseable reply: fall back without caching, so the next step asks again
+                return self._DEFAULT_ACTION
+            if screen_hash is not None and action.startswith(self._HASH_CACHE_VERBS):
+                self._hash_cache.append((screen_hash, task, action, see_line))
+                del self._hash_cache[:-self._HASH_CACHE_SIZE]
+            return action
             
         except Exception as e:
-            error_str = str(e)
-            print(f"LLM Error: {e}")
-            
-            # Handle rate limiting
-            if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                print("⏳ Rate limit hit - waiting before retry...")
-                import re
-                # Extract retry delay if available
-                retry_match = re.search(r'Please retry in (\d+\.?\d*)s', error_str)
-                if retry_match:
-                    delay = float(retry_match.group(1))
-                    print(f"⏳ Waiting {delay:.1f} seconds...")
-                    time.sleep(delay + 1)  # Add 1 second buffer
-                else:
-                    time.sleep(10)  # Default 10 second wait
-                
-                # For browser workflows, provide smart fallback
-                if "safari" in task.lower() or "browser" in task.lower():
-                    if "search" in task.lower():
-                        return 'hotkey("cmd+t")'  # Open new tab for search
-                    
-            return "done()"
+            delay, action = self._llm_error_action(e, task)
+            if delay:
+                time.sleep(delay)
+            return action
+
+    async def think_async(self, task, screenshot_data: bytes, speculative=False):
+        """Non-blocking think() on the SDK's async client; returns (see_line, action).
+
+        A speculative call returns None as its action on errors or unparseable replies
+        instead of the usual recovery actions, so those never get executed as a fallback.
+        """
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model,
+                contents=self._build_contents(task, screenshot_data),
+            )
+            buffer = ""
+            try:
+                async for chunk in stream:
+                    buffer += chunk.text or ""
+                    if self._action_complete(buffer):
+                        break
+            finally:
+                aclose = getattr(stream, "aclose", None)
+                if aclose:
+                    await aclose()
+            see_line, action = self._parse_response(buffer)
+            if speculative:
+                return see_line, action or None
+            return see_line, action or self._DEFAULT_ACTION
+        except Exception as e:
+            if speculative:
+                # The primary call handles any back-off; just go without a fallback
+                print(f"LLM Error (fallback plan): {e}")
+                return "", None
+            delay, action = self._llm_error_action(e, task)
+            if delay:
+                await asyncio.sleep(delay)
+            return "", action
+
+    async def _think_with_fallback(self, task, screenshot_data: bytes):
+        """Plan the next action and an alternative concurrently; returns (see_line, action, fallback)."""
+        (see_line, action), (_, fallback) = await asyncio.gather(
+            self.think_async(task, screenshot_data),
+            self.think_async(task + self._FALLBACK_HINT, screenshot_data, speculative=True),
+        )
+        # Finishing is never a valid recovery for a failed action
+        if fallback and _action_verb(fallback) == "done":
+            fallback = None
+        return see_line, action, fallback
     
     def execute(self, action_text):
+        """Run one action; returns (done, seconds to let the UI settle before the next capture)."""
         print(f"🤖 Harvey: {action_text}")
+        self.last_action_failed = False
+        verb = ""
         
         try:
-            if action_text.startswith("move_mouse"):
-                coords = self._extract_coords(action_text)
-                if coords:
-                    print(f"   → Moving cursor to position")
-                    move_mouse(coords[0], coords[1])
-                    
-            elif action_text.startswith("left_click"):
-                coords = self._extract_coords(action_text)
-                if coords:
-                    print(f"   → Precise clicking to select/activate")
-                    left_click(coords[0], coords[1])
-                    
-            elif action_text.startswith("double_click"):
-                coords = self._extract_coords(action_text)
-                if coords:
-                    print(f"   → Double-clicking to open/activate")
-                    double_click(coords[0], coords[1])
-                    
-            elif action_text.startswith("hover"):
-                coords = self._extract_coords(action_text)
-                if coords:
-                    print(f"   → Hovering to reveal menu/tooltip")
-                    hover(coords[0], coords[1])
-                    
-            elif action_text.startswith("bulk_type"):
-                text = self._extract_text(action_text)
-                if text:
-                    print(f"   → Bulk typing multi-line content")
-                    self._bulk_type_text(text)
-                    
-            elif action_text.startswith("type_text"):
-                text = self._extract_text(action_text)
-                if text:
-                    print(f"   → Typing '{text}' to input text")
-                    type_text(text)
-                    
-            elif action_text.startswith("scroll"):
-                direction = self._extract_text(action_text)
-                if direction:
-                    print(f"   → Scrolling {direction}")
-                    scroll(direction)
-                    
-            elif action_text.startswith("hotkey"):
-                key = self._extract_text(action_text)
-                if key:
-                    if key == "cmd+space":
-                        print(f"   → Opening Spotlight search")
-                    elif key == "cmd+t":
-                        print(f"   → Opening new tab")
-                    elif key == "cmd+l":
-                        print(f"   → Focusing address bar")
-                    elif key == "enter" or key == "return":
-                        print(f"   → Confirming/executing action")
-                    else:
-                        print(f"   → Pressing {key} shortcut")
-                    hotkey(key)
-                    
-            elif action_text.startswith("wait"):
-                ms = self._extract_number(action_text)
-                if ms:
-                    print(f"   → Waiting {ms}ms for page/app to load")
-                    time.sleep(ms / 1000)
-                    
-            elif action_text.startswith("focus_address_bar"):
-                print("   → Focusing browser address bar")
-                print("🔍 Focusing address bar with cmd+l")
-                hotkey("cmd+l")
-                time.sleep(0.3)
-                    
-            elif action_text.startswith("done"):
+            verb = _action_verb(action_text)
+
+            if verb == "done":
                 print("   → Task completed successfully")
-                return True
+                return True, 0.0
+
+            spec = _EXEC_HANDLERS.get(verb)
+            if spec:
+                fn, kind, narration = spec
+                if kind is None:
+                    print(f"   → {narration}")
+                    fn()
+                else:
+                    if kind == "coords":
+                        arg = self._extract_coords(action_text)
+                    elif kind == "number":
+                        arg = self._extract_number(action_text)
+                    else:
+                        arg = self._extract_text(action_text)
+                    if arg:
+                        if verb == "hotkey":
+                            narration = _HOTKEY_NARRATION.get(arg, "Pressing {} shortcut")
+                        print(f"   → {narration.format(arg)}")
+                        if kind == "coords":
+                            fn(*arg)
+                        else:
+                            fn(arg)
+            else:
+                print(f"   → Unhandled action '{verb}' - nothing executed")
+                return False, _UNHANDLED_SETTLE
                 
         except Exception as e:
             print(f"Action error: {e}")
+            self.last_action_failed = True
             
-        return False
-
-    def _bulk_type_text(self, text: str):
-        """Type longer text with line breaks efficiently."""
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if line.strip():  # Skip empty lines
-                type_text(line)
-            if i < len(lines) - 1:  # Don't add extra line break after last line
-                hotkey("enter")
-                time.sleep(0.1)  # Brief pause between lines
-    
-    def _speak_rationale(self, action_text: str, see_line: str, task: str):
-        """Speak what Harvey is going to do and what target it's aiming for."""
+        return False, _SETTLE_DELAY.get(verb, _DEFAULT_SETTLE)
+
+    def _reason_for(self, action_text: str, see_line: str):
+        """Short spoken rationale for what Harvey is going to do, or None."""
+        if not action_text:
+            print("🔇 No action text to speak")
+            return None
+
+        print(f"🎤 TTS enabled, generating speech for: {action_text[:50]}...")
+        # Verb looked up once; the chosen handler parses its argument once
+        handler = _RATIONALE_HANDLERS.get(_action_verb(action_text))
+        reason = handler(action_text, see_line) if handler else None
+        if reason:
+            print(f"🎵 Speaking: '{reason}'")
+        return reason
+    
+    def _play_when_ready(self, audio_future):
+        """Play synthesized audio, waiting briefly for it rather than stalling the loop."""
+        # A newer clip supersedes one that never finished in time
+        self._pending_audio = None
         try:
-            if not _TTS_AVAILABLE:
-                print("🔇 TTS not available - TTS_STT module not found")
-                return
+            self._play_audio(audio_future.result(timeout=0.5))
+        except FutureTimeoutError:
+            # Still synthesizing; the loop plays it via _play_pending_audio once it lands
+            self._pending_audio = audio_future
+        except Exception as e:
+            print(f"❌ TTS error: {e}")
+    
+    def _play_pending_audio(self):
+        """Play a late clip if it has finished; playback always stays on the loop's thread."""
+        audio_future = self._pending_audio
+        if audio_future is None or not audio_future.done():
+            return
+        self._pending_audio = None
+        try:
+            self._play_audio(audio_future.result())
+        except Exception as e:
+            print(f"❌ TTS error: {e}")
+    
+    def _finish_audio(self, timeout=5.0):
+        """Let the last rationale finish before run() returns; exiting would cut off in-process audio."""
+        deadline = time.monotonic() + timeout
+        try:
+            # A final clip may still be synthesizing (e.g. "Task complete.")
+            audio_future, self._pending_audio = self._pending_audio, None
+            if audio_future is not None:
+                self._play_audio(audio_future.result(timeout=max(0.0, deadline - time.monotonic())))
             
-            tts_setting = os.getenv("HARVEY_TTS", "1")
-            if tts_setting in ("0", "false", "False"):
-                print(f"🔇 TTS disabled via HARVEY_TTS={tts_setting}")
+            # NSSound plays inside this process; an afplay child outlives us on its own
+            sound = self._current_sound
+            if sound is None:
                 return
-                
-            if not action_text:
-                print("🔇 No action text to speak")
-                return
-
-            print(f"🎤 TTS enabled, generating speech for: {action_text[:50]}...")
-            action = action_text.strip()
-            reason = None
-
-            if action.startswith("hotkey"):
-                key = self._extract_text(action) or "shortcut"
-                if key == "cmd+space":
-                    reason = "Opening Spotlight."
-                elif key == "cmd+t":
-                    reason = "Opening new tab."
-                elif key in ("enter", "return"):
-                    reason = "Pressing Enter."
-                elif key == "cmd+l":
-                    reason = "Focusing address bar."
-                else:
-                    reason = f"Pressing {key}."
-            elif action.startswith("bulk_type"):
-                txt = self._extract_text(action) or "text"
-                line_count = len(txt.split('\n'))
-                reason = f"Typing {line_count} lines of content."
-            elif action.startswith("type_text"):
-                txt = self._extract_text(action) or "text"
-                if len(txt) > 20:
-                    txt = txt[:17] + "..."
-                reason = f"Typing {txt}."
-            elif action.startswith("left_click"):
-                coords = self._extract_coords(action)
-                # Extract specific target from see_line for better narration
-                if see_line:
-                    target_lower = see_line.lower()
-                    if "compose" in target_lower:
-                        reason = "Clicking compose button."
-                    elif "subject" in target_lower:
-                        reason = "Clicking subject field."
-                    elif "message" in target_lower or "body" in target_lower:
-                        reason = "Clicking message body."
-                    elif "button" in target_lower:
-                        reason = "Clicking button."
-                    elif "icon" in target_lower:
-                        reason = "Clicking icon."
-                    else:
-                        reason = f"Clicking target."
-                else:
-                    reason = "Clicking target."
-            elif action.startswith("double_click"):
-                reason = "Double-clicking to open."
-            elif action.startswith("hover"):
-                reason = "Hovering over element."
-            elif action.startswith("scroll"):
-                direction = self._extract_text(action) or "down"
-                reason = f"Scrolling {direction}."
-            elif action.startswith("wait"):
-                ms = self._extract_number(action) or 1000
-                sec = ms / 1000
-                reason = f"Waiting {sec:.1f} seconds."
-            elif action.startswith("done"):
-                reason = "Task complete."
-
-            if reason:
-                print(f"🎵 Speaking: '{reason}'")
-                # Generate audio file then play it via macOS afplay
-                try:
-                    audio_path = tts_speak(reason)
-                    if audio_path:
-                        print(f"🔊 Playing audio from: {audio_path}")
-                        result = subprocess.run(["afplay", audio_path], capture_output=True, text=True)
-                        if result.returncode != 0:
-                            print(f"❌ afplay failed: {result.stderr}")
-                        else:
-                            print("✅ Audio played successfully")
-                    else:
-                        print("❌ TTS failed to generate audio")
-                except Exception as e:
-                    print(f"❌ TTS error: {e}")
+            run_loop = NSRunLoop.currentRunLoop()
+            while sound.isPlaying() and time.monotonic() < deadline:
+                run_loop.runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(0.05))
         except Exception:
-            # Never let TTS errors break core automation
             pass
     
+    def _play_audio(self, audio_path):
+        """Start playing audio_path without waiting for it to finish."""
+        try:
+            if not audio_path:
+                print("❌ TTS failed to generate audio")
+                return
+            # A newer rationale cuts off one that is still playing
+            if self._current_sound is not None:
+                self._current_sound.stop()
+                self._current_sound = None
+            if self._afplay_proc is not None and self._afplay_proc.poll() is None:
+                self._afplay_proc.terminate()
+            print(f"🔊 Playing audio from: {audio_path}")
+            
+            # Play in-process when AppKit is available; no afplay fork per clip
+            if _APPKIT_AVAILABLE:
+                sound = NSSound.alloc().initWithContentsOfFile_byReference_(audio_path, True)
+                if sound is not None and sound.play():
+                    self._current_sound = sound  # keep a reference so it isn't freed mid-play
+                    return
+            self._afplay_proc = subprocess.Popen(
+                ["afplay", audio_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            print(f"❌ TTS error: {e}")
+    
+    def _tts_audio(self, reason):
+        """Audio file for reason, synthesizing only on a cache miss."""
+        audio_path = self._tts_cache.pop(reason, None)
+        if audio_path and os.path.exists(audio_path):
+            # Re-insert so eviction order tracks recent use
+            self._tts_cache[reason] = audio_path
+            return audio_path
+        
+        audio_path = tts_speak(reason)
+        if not audio_path:
+            return None
+        _TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cached = _TTS_CACHE_DIR / (hashlib.sha1(reason.encode()).hexdigest() + Path(audio_path).suffix)
+        shutil.copyfile(audio_path, cached)
+        self._tts_cache[reason] = str(cached)
+        
+        # Evict the least recently used clip once over the bound
+        if len(self._tts_cache) > _TTS_CACHE_SIZE:
+            oldest = next(iter(self._tts_cache))
+            Path(self._tts_cache.pop(oldest)).unlink(missing_ok=True)
+        return str(cached)
+    
     def _extract_coords(self, text):
         """Extract and validate (ratio_x, ratio_y) from action text."""
-        import re
-        match = re.search(r'\(([0-9.]+),\s*([0-9.]+)\)', text)
-        if match:
-            ratio_x = float(match.group(1))
-            ratio_y = float(match.group(2))
+        coords = _coords_arg(text)
+        if coords:
+            ratio_x, ratio_y = coords
             
             # Validate coordinates are within bounds
             ratio_x = max(0.0, min(1.0, ratio_x))
@@ -876,40 +1273,49 @@ Action: type_text("google docs")"""
         return None
     
     def _extract_text(self, text):
-        import re
-        match = re.search(r'"([^"]*)"', text)
-        if match:
-            return match.group(1)
-        return None
+        return _quoted_arg(text)
     
     def _extract_number(self, text):
-        import re
-        match = re.search(r'\((\d+)\)', text)
-        if match:
-            return int(match.group(1))
-        return None
+        return _number_arg(text)
     
+    def _capture_after(self, delay):
+        """Let the UI settle after an action, then capture the next screenshot."""
+        if delay:
+            time.sleep(delay)
+        return capture_to_bytes()
+
     def run(self, task):
         print(f"🚀 Harvey starting: {task}")
         
-        for step in range(20):
+        max_steps = self.max_steps
+        settle = 0.0  # UI settle time owed before the next inline capture
+        for step in range(max_steps):
+            # One display query per step rather than per coordinate transform
+            invalidate_screen_cache()
             print(f"📸 Taking screenshot to analyze current state...")
-            screenshot_data = capture_to_bytes()
+            if self._next_screenshot_future is not None:
+                screenshot_data = self._next_screenshot_future.result()
+                self._next_screenshot_future = None
+            else:
+                screenshot_data = self._capture_after(settle)
             
-            # DEBUG: Save the first screenshot to see what Harvey is seeing
-            if step == 0 and screenshot_data:
-                print(f"💾 Screenshot data length: {len(screenshot_data)} characters")
+            if not screenshot_data:
+                print("❌ Failed to capture screenshot")
+                break
+                
+            # DEBUG (HARVEY_DEBUG=1): Save the first screenshot to see what Harvey is seeing
+            if self._debug and step == 0:
+                print(f"💾 Screenshot data length: {len(screenshot_data)} bytes")
                 print("💾 Saving debug screenshot as 'harvey_debug.jpg'")
                 with open("harvey_debug.jpg", "wb") as f:
-                    f.write(base64.b64decode(screenshot_data))
+                    f.write(screenshot_data)
                 print("✅ Debug screenshot saved! Check harvey_debug.jpg to see what Harvey sees.")
                 
                 # Also check image dimensions
                 try:
                     from PIL import Image
                     import io
-                    img_bytes = base64.b64decode(screenshot_data)
-                    img = Image.open(io.BytesIO(img_bytes))
+                    img = Image.open(io.BytesIO(screenshot_data))
                     print(f"🖼️  Image dimensions: {img.size[0]}x{img.size[1]} pixels")
                 except Exception as e:
                     print(f"❌ Error reading image: {e}")
@@ -920,21 +1326,45 @@ Action: type_text("google docs")"""
                 except Exception:
                     pass
             
-            if not screenshot_data:
-                print("❌ Failed to capture screenshot")
-                break
-                
-            action = self.think(task, screenshot_data)
-            # Speak a short rationale before executing the action
-            self._speak_rationale(action, getattr(self, "last_see", ""), task)
-            done = self.execute(action)
+            fallback_action = None
+            if self._speculative:
+                see_line, action, fallback_action = self._loop.run_until_complete(
+                    self._think_with_fallback(task, screenshot_data))
+                self._note_see(see_line)
+            else:
+                action = self.think(task, screenshot_data)
+            self._play_pending_audio()
+            # Synthesize the spoken rationale while the action runs
+            tts_future = None
+            if self._tts_on:
+                try:
+                    reason = self._reason_for(action, self.last_see)
+                    if reason:
+                        tts_future = self._tts_pool.submit(self._tts_audio, reason)
+                except Exception:
+                    # Never let TTS errors break core automation
+                    pass
+            done, delay = self.execute(action)
+            if self.last_action_failed and fallback_action and fallback_action != action:
+                print("↩️  Action failed - trying planned fallback")
+                done, delay = self.execute(fallback_action)
             
             if done:
+                if tts_future is not None:
+                    self._play_when_ready(tts_future)
                 print("✅ Task complete!")
                 break
-                
-            time.sleep(1.0)
+            
+            if tts_future is None:
+                # Nothing to overlap; settle and capture inline at the top of the next step
+                settle = delay
+                continue
+            # Settle and capture the next screen on the worker while we wait for the rationale audio
+            if step < max_steps - 1:
+                self._next_screenshot_future = self._executor.submit(self._capture_after, delay)
+            self._play_when_ready(tts_future)
         
+        self._finish_audio()
         print("🏁 Harvey finished")
 
 def main():